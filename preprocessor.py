@@ -1,14 +1,28 @@
 import pandas as pd
+from pandas.tseries.api import guess_datetime_format
 import geopandas as gpd
 import pyogrio
+import shapely
+from pyproj import CRS, Transformer
 import numpy as np
 import json
+import os
 from datetime import datetime
 import warnings
 
+try:
+    import orjson
+except ImportError:  # optional: faster JSON output when available
+    orjson = None
+
 warnings.filterwarnings('ignore')
 
 
+def cache_is_fresh(cache_path, source_path):
+    """True if cache_path exists and is at least as new as source_path."""
+    return os.path.exists(cache_path) and os.path.getmtime(cache_path) >= os.path.getmtime(source_path)
+
+
 def process_demolition_data(
         gpkg_path='ma_structures_FINAL_with_YR_SOURCE.gpkg',
         zoning_path='Boston_Zoning_Subdistricts.geojson'
@@ -27,37 +41,108 @@ def process_demolition_data(
 
     # 1. Load Demolition Data (Using Pyogrio for speed)
     # ---------------------------------------------------------
+    # Centroids + reprojection are deterministic for a given GPKG, so they are
+    # cached next to it as GeoParquet and reused until the GPKG changes.
+    cache_path = gpkg_path + '.centroids.parquet'
     try:
-        gdf = pyogrio.read_dataframe(gpkg_path, use_arrow=True)
-
-        # If geometry is Polygon (building footprints), convert to Centroid (Points)
-        if not gdf.empty and gdf.geometry.iloc[0].geom_type != 'Point':
-            print("   Converting building polygons to centroids...")
-            gdf['geometry'] = gdf.geometry.centroid
+        if cache_is_fresh(cache_path, gpkg_path):
+            print(f"   Loading cached centroids from {cache_path}...")
+            gdf = gpd.read_parquet(cache_path)
+        else:
+            # Read straight to Arrow and work on the WKB geometry column as a shapely array,
+            # so the frame is only built once, from the attribute columns and final points.
+            # pd.ArrowDtype keeps those columns Arrow-backed instead of copying every
+            # string cell into a Python object on conversion.
+            meta, table = pyogrio.read_arrow(gpkg_path)
+            geom_col = meta['geometry_name'] or 'wkb_geometry'
+            geoms = shapely.from_wkb(table[geom_col].to_numpy())
+            crs = CRS.from_user_input(meta['crs']) if meta['crs'] else None
+
+            # If geometry is Polygon (building footprints), convert to Centroid (Points)
+            # (shapely 2 ufuncs run over the whole geometry array in C)
+            if (shapely.get_type_id(geoms) != shapely.GeometryType.POINT).any():
+                print("   Converting building polygons to centroids...")
+                geoms = shapely.centroid(geoms)
+
+            # 2. Ensure Coordinate System is Lat/Lon (EPSG:4326)
+            # ---------------------------------------------------------
+            if crs and crs.to_string() != 'EPSG:4326':
+                print("   Reprojecting demolition data to EPSG:4326...")
+                # One batched pyproj call over every coordinate instead of per-geometry transforms
+                transformer = Transformer.from_crs(crs, 'EPSG:4326', always_xy=True)
+                geoms = shapely.transform(geoms,
+                                          lambda xy: np.column_stack(transformer.transform(xy[:, 0], xy[:, 1])))
+                crs = 'EPSG:4326'
+
+            attrs = table.drop_columns([geom_col]).to_pandas(types_mapper=pd.ArrowDtype)
+            del table
+            gdf = gpd.GeoDataFrame(attrs, geometry=geoms, crs=crs)
+
+            try:
+                gdf.to_parquet(cache_path, compression='zstd')
+                print(f"   Cached centroids to {cache_path}")
+            except Exception as e:
+                print(f"   Warning: Could not write centroid cache ({e}).")
 
     except Exception as e:
         print(f"Error loading GPKG: {e}")
         return None
 
-    # 2. Ensure Coordinate System is Lat/Lon (EPSG:4326)
+    # Filter for Greater Boston Area up front, so only those buildings go through the spatial join
     # ---------------------------------------------------------
-    if gdf.crs and gdf.crs.to_string() != 'EPSG:4326':
-        print("   Reprojecting demolition data to EPSG:4326...")
-        gdf = gdf.to_crs(epsg=4326)
+    initial_ma_count = len(gdf)
+    print("   Filtering to Greater Boston cities...")
+    boston_cities = ['BOSTON', 'CAMBRIDGE', 'SOMERVILLE', 'BROOKLINE', 'QUINCY', 'NEWTON', 'WATERTOWN', 'CHELSEA',
+                     'REVERE', 'EVERETT']
+    # Upper-case the few hundred distinct city names rather than every row, then select by code
+    city = gdf['PROP_CITY'].astype('category')
+    keep_codes = [i for i, c in enumerate(city.cat.categories) if str(c).upper() in boston_cities]
+    gdf = gdf.loc[np.isin(city.cat.codes.to_numpy(), keep_codes)]
+    gdf['PROP_CITY'] = city
 
     # 3. Spatial Join with Zoning Data
     # ---------------------------------------------------------
     print(f"2. Loading zoning data from {zoning_path}...")
     try:
-        zoning_gdf = gpd.read_file(zoning_path)
+        # The parsed (and reprojected) zoning layer is cached as GeoParquet the same way,
+        # so later runs skip the GeoJSON parse
+        zoning_cache_path = zoning_path + '.zoning.parquet'
+        if cache_is_fresh(zoning_cache_path, zoning_path):
+            print(f"   Loading cached zoning layer from {zoning_cache_path}...")
+            zoning_gdf = gpd.read_parquet(zoning_cache_path)
+        else:
+            # Only the district/subdistrict attributes are used, skip the other columns
+            zoning_gdf = pyogrio.read_dataframe(zoning_path, columns=['Zoning_District', 'Zoning_Subdistrict'],
+                                                use_arrow=True)
 
-        if zoning_gdf.crs and zoning_gdf.crs.to_string() != 'EPSG:4326':
-            zoning_gdf = zoning_gdf.to_crs(epsg=4326)
+            if zoning_gdf.crs and zoning_gdf.crs.to_string() != 'EPSG:4326':
+                zoning_gdf = zoning_gdf.to_crs(epsg=4326)
+
+            try:
+                zoning_gdf.to_parquet(zoning_cache_path, compression='zstd')
+                print(f"   Cached zoning layer to {zoning_cache_path}")
+            except Exception as e:
+                print(f"   Warning: Could not write zoning cache ({e}).")
 
         print("   Performing spatial join (matching points to districts)...")
-        gdf = gpd.sjoin(gdf, zoning_gdf[['geometry', 'Zoning_District', 'Zoning_Subdistrict']], how='left',
-                        predicate='within')
-        gdf = gdf[~gdf.index.duplicated(keep='first')]
+        # Bulk point-in-polygon query on an STRtree of the zoning polygons,
+        # assembled directly instead of going through sjoin's merge.
+        # Candidates come from the bounding-box query; the exact test then runs as a
+        # vectorised contains() on prepared zoning polygons (same result as 'within').
+        zones = np.asarray(zoning_gdf.geometry.values)
+        points = np.asarray(gdf.geometry.values)
+        shapely.prepare(zones)
+        tree = shapely.STRtree(zones)
+        pt_idx, zone_idx = tree.query(points)
+        inside = shapely.contains(zones[zone_idx], points[pt_idx])
+        pt_idx, zone_idx = pt_idx[inside], zone_idx[inside]
+        # A point inside overlapping zones keeps its first match (like keep='first' after sjoin)
+        order = np.lexsort((zone_idx, pt_idx))
+        pt_idx, zone_idx = pt_idx[order], zone_idx[order]
+        pt_idx, first = np.unique(pt_idx, return_index=True)
+        zone_idx = zone_idx[first]
+        for col in ['Zoning_District', 'Zoning_Subdistrict']:
+            gdf[col] = zoning_gdf[col].iloc[zone_idx].set_axis(gdf.index[pt_idx]).reindex(gdf.index)
     except Exception as e:
         print(f"   Warning: Could not process zoning data ({e}). Zoning features will be skipped.")
         gdf['Zoning_District'] = None
@@ -65,24 +150,41 @@ def process_demolition_data(
 
     # 4. Extract Coordinates and Convert to Standard DataFrame
     # ---------------------------------------------------------
-    gdf['LONGITUDE'] = gdf.geometry.x
-    gdf['LATITUDE'] = gdf.geometry.y
-
-    # Drop geometry to save memory
-    df = pd.DataFrame(gdf.drop(columns='geometry'))
-    initial_ma_count = len(df)
+    geoms = np.asarray(gdf.geometry.values)
+    gdf['LONGITUDE'] = shapely.get_x(geoms)
+    gdf['LATITUDE'] = shapely.get_y(geoms)
+
+    # Keep only the columns read below so every later mask/groupby scans less memory.
+    # Geometry is not among them, so this selection already yields a plain DataFrame
+    # (no separate drop + pd.DataFrame copy of the full-width frame).
+    used_columns = ['PROP_CITY', 'year_built', 'DEMOLITION_DATE', 'DEMOLITION_TYPE', 'DEMOLITION_STATUS',
+                    'material_type_desc', 'foundation_type', 'Est GFA sqmeters', 'Zoning_District',
+                    'Zoning_Subdistrict', 'LONGITUDE', 'LATITUDE']
+    df = gdf[[c for c in used_columns if c in gdf.columns]]
+
+    # Low-cardinality text columns become categoricals right after loading (PROP_CITY already is),
+    # so the string clean-up below runs once per distinct value instead of once per row
+    for col in ['DEMOLITION_TYPE', 'DEMOLITION_STATUS', 'material_type_desc', 'foundation_type', 'Zoning_District',
+                'Zoning_Subdistrict']:
+        if col in df.columns: df[col] = df[col].astype('category')
+
+    def strip_categories(series, fill):
+        """series.fillna(fill).str.strip() as a categorical, computed on the categories only."""
+        series = series.astype('category')
+        # Code -1 (missing) picks up the fill value at the end
+        labels = np.append(series.cat.categories.astype(str).str.strip().to_numpy(dtype=object), fill)
+        groups, codes = np.unique(labels, return_inverse=True)
+        return pd.Series(pd.Categorical.from_codes(codes[series.cat.codes.to_numpy()], categories=groups),
+                         index=series.index)
 
     # 5. Data Cleaning & Calculation
     # ---------------------------------------------------------
     print("3. Cleaning and filtering data...")
 
-    # Filter for Greater Boston Area
-    boston_cities = ['BOSTON', 'CAMBRIDGE', 'SOMERVILLE', 'BROOKLINE', 'QUINCY', 'NEWTON', 'WATERTOWN', 'CHELSEA',
-                     'REVERE', 'EVERETT']
-    df = df[df['PROP_CITY'].astype(str).str.upper().isin(boston_cities)].copy()
-
     # Ensure numeric year_built
-    df['year_built'] = pd.to_numeric(df['year_built'], errors='coerce')
+    # (as plain float64 with NaN for missing: the Arrow-backed columns would give a nullable
+    # result, whose pd.NA means and null-only fillna differ from the NaN handling below)
+    df['year_built'] = pd.to_numeric(df['year_built'], errors='coerce').to_numpy(dtype=float, na_value=np.nan)
 
     # Calculate Current Age for ALL buildings (Current Year - Year Built)
     # We do this BEFORE filtering out non-demolished buildings
@@ -91,12 +193,26 @@ def process_demolition_data(
 
     # --- KEY CHANGE: CREATE A COPY OF ALL BUILDINGS HERE ---
     # This dataframe contains everything: existing buildings AND demolished ones
+    # (only the columns the zoning density stats and metadata read from it)
     print("   Creating snapshot of all buildings (for zoning density stats)...")
-    all_buildings_df = df.copy()
+    all_buildings_df = df[['Zoning_District', 'year_built', 'current_age']]
 
     # Handle Dates for Demolition Calculation
-    df['DEMOLITION_DATE'] = pd.to_datetime(df['DEMOLITION_DATE'], errors='coerce')
-    df['demolition_year'] = df['DEMOLITION_DATE'].dt.year
+    # Only the year is used. Dates stored as text repeat a lot, so each distinct
+    # string is parsed once and its year mapped back through the category codes.
+    dates = df.pop('DEMOLITION_DATE')
+    if pd.api.types.is_datetime64_any_dtype(dates.dtype):
+        df['demolition_year'] = pd.to_datetime(dates, errors='coerce').dt.year.to_numpy(dtype=float, na_value=np.nan)
+    else:
+        # pd.to_datetime infers the format from the first non-null row; the categories are
+        # sorted, so guess it from that row here and pass it on ('mixed' when it can't be
+        # guessed, matching the per-value fallback)
+        present = dates.dropna()
+        date_format = guess_datetime_format(str(present.iloc[0])) if len(present) else None
+        dates = dates.astype('category')
+        years = pd.to_datetime(dates.cat.categories, format=date_format or 'mixed',
+                               errors='coerce').year.to_numpy(dtype=float, na_value=np.nan)
+        df['demolition_year'] = np.append(years, np.nan)[dates.cat.codes.to_numpy()]
 
     # Calculate Lifespan
     df['lifespan'] = df['demolition_year'] - df['year_built']
@@ -106,74 +222,88 @@ def process_demolition_data(
     # df now becomes "Demolished Buildings Only"
     df = df[df['lifespan'] < 500]
 
+    # After the filter these are whole years with no gaps, so int16 holds them exactly
+    # in a quarter of the float64 bytes that every later scan reads
+    for col in ['year_built', 'current_age', 'demolition_year', 'lifespan']:
+        vals = df[col].to_numpy(dtype=float)
+        if np.array_equal(vals, vals.astype(np.int16)):
+            df[col] = vals.astype(np.int16)
+
     # Handle Material and Foundation columns
     if 'material_type_desc' not in df.columns: df['material_type_desc'] = 'Unknown'
     if 'foundation_type' not in df.columns: df['foundation_type'] = 'Unknown'
 
-    # Also handle missing material for the all_buildings_df for accurate filtering later if needed
-    if 'material_type_desc' not in all_buildings_df.columns: all_buildings_df['material_type_desc'] = 'Unknown'
     if 'Est GFA sqmeters' not in df.columns:
         print("   Warning: 'Est GFA sqmeters' column not found! Defaulting to 0.")
         df['Est GFA sqmeters'] = 0
-        all_buildings_df['Est GFA sqmeters'] = 0
 
-    df['Est GFA sqmeters'] = pd.to_numeric(df['Est GFA sqmeters'], errors='coerce').fillna(0)
-    all_buildings_df['Est GFA sqmeters'] = pd.to_numeric(all_buildings_df['Est GFA sqmeters'], errors='coerce').fillna(
-        0)
+    df['Est GFA sqmeters'] = pd.to_numeric(df['Est GFA sqmeters'], errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+    df['Est GFA sqmeters'] = df['Est GFA sqmeters'].fillna(0)
 
-    df['material_group'] = df['material_type_desc'].fillna('Unknown').str.strip()
-    all_buildings_df['material_group'] = all_buildings_df['material_type_desc'].fillna('Unknown').str.strip()
+    df['material_group'] = strip_categories(df['material_type_desc'], 'Unknown')
 
     print("   Mapping DEMOLITION_STATUS to Open/Close...")
     if 'DEMOLITION_STATUS' in df.columns:
-        def simple_status_check(val):
-            if pd.isna(val): return 'Open'
-            s = str(val).strip().upper()
-            if s in ['CLOSED', 'CLOSE']: return 'Close'
-            return 'Open'
-
-        df['status_norm'] = df['DEMOLITION_STATUS'].apply(simple_status_check)
+        # Close only for CLOSED/CLOSE (any case/padding); missing and everything else is Open
+        status = df['DEMOLITION_STATUS']
+        closed_codes = [i for i, c in enumerate(status.cat.categories) if str(c).strip().upper() in ['CLOSED', 'CLOSE']]
+        is_closed = np.isin(status.cat.codes.to_numpy(), closed_codes).astype(np.int8)
     else:
-        df['status_norm'] = 'Close'
+        is_closed = np.ones(len(df), dtype=np.int8)
+    # Built straight from 0/1 codes, without an intermediate array of strings
+    df['status_norm'] = pd.Categorical.from_codes(is_closed, categories=['Open', 'Close'])
+
+    # These columns are only ever compared, isin-tested or grouped on, so store them as
+    # categoricals: comparisons and groupbys then run on int codes instead of strings
+    for col in ['PROP_CITY', 'DEMOLITION_TYPE', 'material_group', 'Zoning_District', 'Zoning_Subdistrict',
+                'foundation_type']:
+        df[col] = df[col].astype('category')
+
+    def most_common(series, n):
+        # value_counts on a categorical breaks ties by category order; keep first-appearance order
+        counts = series.value_counts()
+        return sorted(series.unique(), key=lambda v: -counts[v])[:n]
 
     # ==========================================
     # GENERATE JSON STRUCTURE
     # ==========================================
     result = {}
 
-    demo_avg = {}
-    for dtype in ['RAZE', 'EXTDEM', 'INTDEM']:
-        sub = df[df['DEMOLITION_TYPE'] == dtype]
-        sub_pos = sub[sub['lifespan'] > 0]
-        demo_avg[dtype] = float(sub_pos['lifespan'].mean()) if not sub_pos.empty else 0.0
+    # Positive-lifespan rows and per-type counts are shared by the averages and summary below
+    pos_lifespan_df = df[df['lifespan'] > 0]
+    type_counts = df['DEMOLITION_TYPE'].value_counts()
+
+    pos_avg_by_type = pos_lifespan_df.groupby('DEMOLITION_TYPE', observed=True)['lifespan'].mean()
+    demo_avg = {dtype: float(pos_avg_by_type.get(dtype, 0.0)) for dtype in ['RAZE', 'EXTDEM', 'INTDEM']}
 
     result['material_lifespan_demo_avg'] = demo_avg
 
     # --- A. Summary Stats ---
     raze_df = df[df['DEMOLITION_TYPE'] == 'RAZE']
-    r_pos = raze_df[raze_df['lifespan'] > 0]
-    r_zero = raze_df[raze_df['lifespan'] == 0]
-    r_neg = raze_df[raze_df['lifespan'] < 0]
 
-    def get_counts(d):
+    # Open/Close counts for positive, zero and negative lifespans in one np.bincount over
+    # (lifespan sign, status code): rows are positive/zero/negative, columns the Open/Close codes
+    sign = np.sign(raze_df['lifespan'].to_numpy(dtype=float)).astype(np.int64)
+    status_by_sign = np.bincount((1 - sign) * 2 + raze_df['status_norm'].cat.codes.to_numpy(),
+                                 minlength=6).reshape(3, 2)
+
+    def get_counts(counts):
         return {
-            'open': int((d['status_norm'] == 'Open').sum()),
-            'close': int((d['status_norm'] == 'Close').sum())
+            'open': int(counts[0]),
+            'close': int(counts[1])
         }
 
-    sb_positive = get_counts(r_pos)
-    sb_zero = get_counts(r_zero)
-    sb_negative = get_counts(r_neg)
-    sb_total = get_counts(raze_df)
-
-    pos_lifespan_df = df[df['lifespan'] > 0]
+    sb_positive = get_counts(status_by_sign[0])
+    sb_zero = get_counts(status_by_sign[1])
+    sb_negative = get_counts(status_by_sign[2])
+    sb_total = get_counts(status_by_sign.sum(axis=0))
 
     result['summary_stats'] = {
         'total_demolitions': int(len(df)),
         'average_lifespan': float(pos_lifespan_df['lifespan'].mean()) if not pos_lifespan_df.empty else 0,
-        'raze_count': int(len(raze_df)),
-        'extdem_count': int((df['DEMOLITION_TYPE'] == 'EXTDEM').sum()),
-        'intdem_count': int((df['DEMOLITION_TYPE'] == 'INTDEM').sum()),
+        'raze_count': int(type_counts.get('RAZE', 0)),
+        'extdem_count': int(type_counts.get('EXTDEM', 0)),
+        'intdem_count': int(type_counts.get('INTDEM', 0)),
         'negative_raze_count': sb_negative['close'],
         'zero_raze_count': sb_zero['close'],
         'avg_current_building_age': float(all_buildings_df['current_age'].mean()) if not all_buildings_df.empty else 0,
@@ -186,19 +316,35 @@ def process_demolition_data(
 
     # --- B. Map Points ---
     print("4. Generating Map Points...")
-    map_data = []
-    for _, row in df.iterrows():
-        if pd.notna(row['LATITUDE']):
-            map_data.append({
-                'lat': float(row['LATITUDE']),
-                'lng': float(row['LONGITUDE']),
-                'type': row['DEMOLITION_TYPE'],
-                'lifespan': int(row['lifespan']),
-                'status': row['status_norm'],
-                'year_built': int(row['year_built']),
-                'material': str(row['material_group']),
-                'foundation': str(row.get('foundation_type', 'N/A'))
-            })
+    def category_labels(series, missing):
+        """Python str labels of a categorical, with `missing` for missing values.
+
+        Taken through the codes (code -1 picks the last label), so a missing value never
+        reaches the JSON as pd.NA, whatever marker the column's dtype uses.
+        """
+        labels = np.append(series.cat.categories.astype(str).to_numpy(dtype=object), missing)
+        return labels[series.cat.codes.to_numpy()].tolist()
+
+    def make_points(p_df, with_type=False):
+        """Columnar point data for the dashboard maps ({field: [values]}); rows without coordinates are skipped."""
+        # Parallel arrays instead of one dict per point: each field is written once, not once
+        # per point. Coordinates are rounded to 6 decimals (~0.1 m).
+        p_df = p_df.loc[p_df['LATITUDE'].notna().to_numpy()]
+        columns = {
+            'lat': np.round(p_df['LATITUDE'].to_numpy(dtype=float), 6).tolist(),
+            'lng': np.round(p_df['LONGITUDE'].to_numpy(dtype=float), 6).tolist(),
+        }
+        if with_type:
+            columns['type'] = category_labels(p_df['DEMOLITION_TYPE'], None)
+        columns['lifespan'] = p_df['lifespan'].to_numpy(dtype=float).astype(np.int64).tolist()
+        columns['status'] = category_labels(p_df['status_norm'], None)
+        columns['year_built'] = p_df['year_built'].to_numpy(dtype=float).astype(np.int64).tolist()
+        columns['material'] = category_labels(p_df['material_group'], 'None')
+        # A missing foundation is written as 'None', as in the published dataset
+        columns['foundation'] = category_labels(p_df['foundation_type'], 'None')
+        return columns
+
+    map_data = make_points(df, with_type=True)
     result['map_points'] = map_data
 
     # --- C. Zoning District Stats (CORRECTED LOGIC) ---
@@ -209,73 +355,121 @@ def process_demolition_data(
     all_districts = all_buildings_df['Zoning_District'].dropna().unique()
 
     def make_hist(series, width=10):
-        if series.empty: return []
+        vals = series.to_numpy(dtype=float, na_value=np.nan)
         # Filter reasonable age range
-        series = series[(series >= 0) & (series < 500)]
-        if series.empty: return []
-        bins = range(0, int(series.max()) + width, width)
-        return [{'range': f"{b}-{b + width}", 'count': int(((series >= b) & (series < b + width)).sum())} for b in bins]
-
-    def make_district_heatmap(d_df, bin_size=20):
-        heatmap_counts = {}
-        heatmap_gfa = {}
-        if d_df.empty: return {'count': {}, 'gfa': {}}
-
-        top_materials = d_df['material_group'].value_counts().head(15).index.tolist()
-
-        for mat in top_materials:
-            mat_df = d_df[d_df['material_group'] == mat]
-            if len(mat_df) == 0: continue
-            bins_c = {}
-            bins_g = {}
-            for i in range(0, 200, bin_size):
-                label = f"{i}-{i + bin_size}"
-                mask = (mat_df['lifespan'] >= i) & (mat_df['lifespan'] < i + bin_size)
-                subset = mat_df[mask]
-                count = len(subset)
-                if count > 0:
-                    bins_c[label] = int(count)
-                    bins_g[label] = int(subset['Est GFA sqmeters'].sum())
-            if bins_c:
-                heatmap_counts[mat] = bins_c
-                heatmap_gfa[mat] = bins_g
+        vals = vals[(vals >= 0) & (vals < 500)]
+        if vals.size == 0: return []
+        starts = np.arange(0, int(vals.max()) + width, width)
+        counts, _ = np.histogram(vals, bins=np.append(starts, starts[-1] + width))
+        return [{'range': f"{b}-{b + width}", 'count': int(c)} for b, c in zip(starts, counts)]
+
+    def make_district_hists(d_df, col, width=10):
+        """make_hist of `col` for every Zoning_District of d_df at once, from one np.bincount over (district, bin)."""
+        codes = d_df['Zoning_District'].cat.codes.to_numpy().astype(np.int64)
+        vals = d_df[col].to_numpy(dtype=float, na_value=np.nan)
+        ok = (codes >= 0) & (vals >= 0) & (vals < 500)
+        codes, vals = codes[ok], vals[ok]
+        n_dists, n_bins = len(d_df['Zoning_District'].cat.categories), 500 // width + 1
+        counts = np.bincount(codes * n_bins + (vals // width).astype(np.int64),
+                             minlength=n_dists * n_bins).reshape(n_dists, n_bins)
+        # Each district's bins run up to its own int(max), exactly as make_hist lays them out
+        top = np.full(n_dists, -1)
+        np.maximum.at(top, codes, vals.astype(np.int64))
+        return {dist: [{'range': f"{b}-{b + width}", 'count': int(counts[k, b // width])}
+                       for b in (range(0, top[k] + width, width) if top[k] >= 0 else [])]
+                for k, dist in enumerate(d_df['Zoning_District'].cat.categories)}
+
+    mat_index = {mat: i for i, mat in enumerate(df['material_group'].cat.categories)}
+
+    def bin_totals(b_df, group_codes, n_groups, bin_size):
+        """Count and GFA total per (group, material, lifespan bin) for lifespans in [0, 200).
+
+        Group, material and bin fold into one flat index, so np.bincount (plain and
+        GFA-weighted) fills the whole array in a single pass. Negative group codes are skipped.
+        """
+        n_mats = len(mat_index)
+        n_bins = len(range(0, 200, bin_size))
+        lifespans = b_df['lifespan'].to_numpy(dtype=float, na_value=np.nan)
+        ok = (group_codes >= 0) & (lifespans >= 0) & (lifespans < n_bins * bin_size)
+        flat = ((group_codes[ok] * n_mats + b_df['material_group'].cat.codes.to_numpy()[ok]) * n_bins
+                + (lifespans[ok] // bin_size).astype(np.int64))
+        size = n_groups * n_mats * n_bins
+        counts = np.bincount(flat, minlength=size).reshape(n_groups, n_mats, n_bins)
+        gfa = np.bincount(flat, weights=b_df['Est GFA sqmeters'].to_numpy(dtype=float)[ok], minlength=size)
+        return counts, gfa.reshape(n_groups, n_mats, n_bins)
+
+    def bins_to_dict(counts, gfa, materials, labels):
+        """{material: {bin label: value}} for one group's totals, empty bins left out, in `materials` order."""
+        bins_c = {}
+        bins_g = {}
+        for mat in materials:
+            j = mat_index[mat]
+            nz = np.flatnonzero(counts[j])
+            if nz.size:
+                bins_c[mat] = {labels[b]: int(counts[j, b]) for b in nz}
+                bins_g[mat] = {labels[b]: int(gfa[j, b]) for b in nz}
+        return bins_c, bins_g
+
+    # RAZE heatmap totals for every district at once (20-year bins)
+    district_index = {d: i for i, d in enumerate(raze_df['Zoning_District'].cat.categories)}
+    raze_dist_codes = raze_df['Zoning_District'].cat.codes.to_numpy().astype(np.int64)
+    district_counts, district_gfa = bin_totals(raze_df, raze_dist_codes, len(district_index), 20)
+    district_labels = [f"{i}-{i + 20}" for i in range(0, 200, 20)]
+
+    # Material count and first row per (district, material) from the integer codes in one pass,
+    # so each district's top 15 needs no value_counts of its own
+    materials = list(df['material_group'].cat.categories)
+    in_dist = np.flatnonzero(raze_dist_codes >= 0)
+    dist_mat = (raze_dist_codes[in_dist] * len(materials)
+                + raze_df['material_group'].cat.codes.to_numpy().astype(np.int64)[in_dist])
+    dist_mat_counts = np.bincount(dist_mat, minlength=len(district_index) * len(materials)).reshape(
+        len(district_index), len(materials))
+    dist_mat_first = np.full(len(district_index) * len(materials), len(raze_df))
+    np.minimum.at(dist_mat_first, dist_mat, in_dist)
+    dist_mat_first = dist_mat_first.reshape(len(district_index), len(materials))
+
+    def make_district_heatmap(dist):
+        k = district_index.get(dist)
+        if k is None or not dist_mat_counts[k].any(): return {'count': {}, 'gfa': {}}
+
+        # Most common first, ties in order of first appearance (as most_common)
+        order = np.lexsort((dist_mat_first[k], -dist_mat_counts[k]))
+        top_materials = [materials[j] for j in order[dist_mat_counts[k][order] > 0][:15]]
+        heatmap_counts, heatmap_gfa = bins_to_dict(district_counts[k], district_gfa[k], top_materials,
+                                                   district_labels)
         return {'count': heatmap_counts, 'gfa': heatmap_gfa}
 
-    for dist in all_districts:
-        # 1. Get Demolished data for this district (from df)
-        d_demo_df = df[df['Zoning_District'] == dist]
-        r_df = d_demo_df[d_demo_df['DEMOLITION_TYPE'] == 'RAZE']
-        r_pos = r_df[r_df['lifespan'] > 0]
+    # Split the RAZE frame by district once instead of re-masking it per district;
+    # the scalar stats come straight from groupby aggregates
+    raze_by_dist = dict(tuple(raze_df.groupby('Zoning_District', sort=False, observed=True)))
+    no_raze_df = raze_df.iloc[0:0]
+    raze_pos_avg = (raze_df[raze_df['lifespan'] > 0]
+                    .groupby('Zoning_District', observed=True)['lifespan'].mean())
+    all_agg = all_buildings_df.groupby('Zoning_District', observed=True)['current_age'].agg(['size', 'mean'])
+    # NaN (not pd.NA) for a district whose ages are all missing
+    all_agg['mean'] = all_agg['mean'].to_numpy(dtype=float, na_value=np.nan)
+    raze_hists = make_district_hists(raze_df, 'lifespan')
+    age_hists = make_district_hists(all_buildings_df, 'current_age')
 
-        # 2. Get ALL Building data for this district (from all_buildings_df)
-        d_all_df = all_buildings_df[all_buildings_df['Zoning_District'] == dist]
+    for dist in all_districts:
+        # Demolished (RAZE) data for this district (from df)
+        r_df = raze_by_dist.get(dist, no_raze_df)
 
         # Points for Map (Only RAZE)
-        points = []
-        for _, r in r_df.iterrows():
-            if pd.notna(r['LATITUDE']):
-                points.append({
-                    'lat': r['LATITUDE'],
-                    'lng': r['LONGITUDE'],
-                    'lifespan': int(r['lifespan']),
-                    'status': r['status_norm'],
-                    'year_built': int(r['year_built']),
-                    'material': str(r['material_group']),
-                    'foundation': str(r.get('foundation_type', 'N/A'))
-                })
+        points = make_points(r_df)
 
         zoning_stats[str(dist)] = {
             # Demolition Stats (from df)
             'count_raze': int(len(r_df)),
-            'avg_raze_lifespan': float(r_pos['lifespan'].mean()) if len(r_pos) > 0 else 0,
-            'demolished_age_distribution_10yr': make_hist(r_df['lifespan']),
-            'heatmap_data': make_district_heatmap(r_df, bin_size=20),
+            'avg_raze_lifespan': float(raze_pos_avg[dist]) if dist in raze_pos_avg.index else 0,
+            'demolished_age_distribution_10yr': raze_hists.get(dist, []),
+            'heatmap_data': make_district_heatmap(dist),
             'positive_raze_points': points,
 
             # Full Inventory Stats (from all_buildings_df)
-            'count_total': int(len(d_all_df)),  # TRUE Total Buildings count
-            'avg_current_age': float(d_all_df['current_age'].mean()) if len(d_all_df) > 0 else 0,  # TRUE Avg Age
-            'current_age_distribution_10yr': make_hist(d_all_df['current_age']),  # TRUE Age Distribution
+            'count_total': int(all_agg.at[dist, 'size']),  # TRUE Total Buildings count
+            'avg_current_age': float(all_agg.at[dist, 'mean']),  # TRUE Avg Age
+            'current_age_distribution_10yr': age_hists[dist],  # TRUE Age Distribution
         }
 
     result['zoning_district_stats'] = zoning_stats
@@ -283,46 +477,47 @@ def process_demolition_data(
 
     # --- D. Zoning Subdistrict Stats ---
     sub_stats = {}
+    raze_avg_by_sub = raze_df.groupby('Zoning_Subdistrict', observed=True)['lifespan'].mean()
     for sub in df['Zoning_Subdistrict'].dropna().unique():
-        s_df = df[(df['Zoning_Subdistrict'] == sub) & (df['DEMOLITION_TYPE'] == 'RAZE')]
-        if len(s_df) > 0:
-            sub_stats[str(sub)] = {'avg_raze_lifespan': float(s_df['lifespan'].mean())}
+        if sub in raze_avg_by_sub.index:
+            sub_stats[str(sub)] = {'avg_raze_lifespan': float(raze_avg_by_sub[sub])}
     result['zoning_subdistrict_stats'] = sub_stats
 
-    # --- F. Material Heatmap Data (No changes needed, uses Demolition data) ---
+    # --- F. Material Heatmap Data (uses Demolition data) ---
     print("7. Generating Material Heatmap data...")
     material_lifespan_demo = {}
     material_lifespan_demo_gfa = {}
     bin_sizes = [10, 20, 25, 30, 50]
 
-    for demo_type in ['RAZE', 'EXTDEM', 'INTDEM', 'all']:
+    # Every (demolition type, material, lifespan bin) total for a bin size comes out of
+    # one bin_totals pass; 'all' is the sum over the type axis.
+    # Any other/missing type gets a trailing slot so it still counts towards 'all'.
+    demo_codes = pd.Categorical(df['DEMOLITION_TYPE'], categories=['RAZE', 'EXTDEM', 'INTDEM']).codes.astype(np.int64)
+    demo_codes[demo_codes < 0] = 3
+
+    # Material order per type (first appearance) from one pass over the (type, material) pairs
+    first_seen = df[['DEMOLITION_TYPE', 'material_group']].drop_duplicates()
+    type_materials = {'all': df['material_group'].unique()}
+    for demo_type in ['RAZE', 'EXTDEM', 'INTDEM']:
+        type_materials[demo_type] = first_seen.loc[first_seen['DEMOLITION_TYPE'] == demo_type, 'material_group']
         material_lifespan_demo[demo_type] = {}
         material_lifespan_demo_gfa[demo_type] = {}
-        if demo_type == 'all':
-            type_df = df
-        else:
-            type_df = df[df['DEMOLITION_TYPE'] == demo_type]
-
-        for bin_size in bin_sizes:
-            bin_key = f'bin_{bin_size}'
-            material_lifespan_demo[demo_type][bin_key] = {}
-            material_lifespan_demo_gfa[demo_type][bin_key] = {}
-            for mat in type_df['material_group'].unique():
-                mat_df = type_df[type_df['material_group'] == mat]
-                if len(mat_df) == 0: continue
-                bins_c = {}
-                bins_g = {}
-                for i in range(0, 200, bin_size):
-                    label = f"{i}-{i + bin_size} years" if i < 150 else f"{i}+ years"
-                    mask = (mat_df['lifespan'] >= i) & (mat_df['lifespan'] < i + bin_size)
-                    subset = mat_df[mask]
-                    count = len(subset)
-                    if count > 0:
-                        bins_c[label] = int(count)
-                        bins_g[label] = int(subset['Est GFA sqmeters'].sum())
-                if bins_c:
-                    material_lifespan_demo[demo_type][bin_key][mat] = bins_c
-                    material_lifespan_demo_gfa[demo_type][bin_key][mat] = bins_g
+    material_lifespan_demo['all'] = {}
+    material_lifespan_demo_gfa['all'] = {}
+
+    for bin_size in bin_sizes:
+        bin_key = f'bin_{bin_size}'
+        labels = [f"{i}-{i + bin_size} years" if i < 150 else f"{i}+ years" for i in range(0, 200, bin_size)]
+        counts, gfa_sums = bin_totals(df, demo_codes, 4, bin_size)
+
+        for k, demo_type in enumerate(['RAZE', 'EXTDEM', 'INTDEM', 'all']):
+            if demo_type == 'all':
+                t_counts, t_gfa = counts.sum(axis=0), gfa_sums.sum(axis=0)
+            else:
+                t_counts, t_gfa = counts[k], gfa_sums[k]
+            bins_c, bins_g = bins_to_dict(t_counts, t_gfa, type_materials[demo_type], labels)
+            material_lifespan_demo[demo_type][bin_key] = bins_c
+            material_lifespan_demo_gfa[demo_type][bin_key] = bins_g
 
     result['material_lifespan_demo'] = material_lifespan_demo
     result['material_lifespan_demo_gfa'] = material_lifespan_demo_gfa
@@ -330,14 +525,14 @@ def process_demolition_data(
     # --- G, H, I Legacy Features ---
     # Yearly Stacked (Uses Demolition Data)
     yearly_data = []
-    years = sorted(df['demolition_year'].unique())
-    for year in years:
-        y_df = df[df['demolition_year'] == year]
+    yearly_ct = pd.crosstab(df['demolition_year'].astype(int), df['DEMOLITION_TYPE']).reindex(
+        columns=['RAZE', 'EXTDEM', 'INTDEM'], fill_value=0)
+    for year, (n_raze, n_extdem, n_intdem) in zip(yearly_ct.index, yearly_ct.to_numpy()):
         row = {
             'year': int(year),
-            'RAZE': int((y_df['DEMOLITION_TYPE'] == 'RAZE').sum()),
-            'EXTDEM': int((y_df['DEMOLITION_TYPE'] == 'EXTDEM').sum()),
-            'INTDEM': int((y_df['DEMOLITION_TYPE'] == 'INTDEM').sum()),
+            'RAZE': int(n_raze),
+            'EXTDEM': int(n_extdem),
+            'INTDEM': int(n_intdem),
             'demolished_and_replaced': 0
         }
         row.update({f"{k}_closed": v for k, v in row.items() if k != 'year'})
@@ -347,19 +542,20 @@ def process_demolition_data(
 
     # Lifespan Dist
     dist_10yr = make_hist(df['lifespan'], 10)
+    # Count every (10-year bin, type) pair in one crosstab, keyed by bin start
+    dist_ct = pd.crosstab((df['lifespan'] // 10 * 10).astype(int), df['DEMOLITION_TYPE']).reindex(
+        index=[int(item['range'].split('-')[0]) for item in dist_10yr],
+        columns=['RAZE', 'EXTDEM', 'INTDEM'], fill_value=0)
     final_dist = []
-    for item in dist_10yr:
-        rng = item['range']
-        s, e = map(int, rng.split('-'))
-        sub_df = df[(df['lifespan'] >= s) & (df['lifespan'] < e)]
+    for item, (n_raze, n_extdem, n_intdem) in zip(dist_10yr, dist_ct.to_numpy()):
         final_dist.append({
-            'range': rng,
-            'RAZE': int((sub_df['DEMOLITION_TYPE'] == 'RAZE').sum()),
-            'EXTDEM': int((sub_df['DEMOLITION_TYPE'] == 'EXTDEM').sum()),
-            'INTDEM': int((sub_df['DEMOLITION_TYPE'] == 'INTDEM').sum()),
-            'RAZE_closed': int((sub_df['DEMOLITION_TYPE'] == 'RAZE').sum()),
-            'EXTDEM_closed': int((sub_df['DEMOLITION_TYPE'] == 'EXTDEM').sum()),
-            'INTDEM_closed': int((sub_df['DEMOLITION_TYPE'] == 'INTDEM').sum()),
+            'range': item['range'],
+            'RAZE': int(n_raze),
+            'EXTDEM': int(n_extdem),
+            'INTDEM': int(n_intdem),
+            'RAZE_closed': int(n_raze),
+            'EXTDEM_closed': int(n_extdem),
+            'INTDEM_closed': int(n_intdem),
         })
     result['lifespan_distribution'] = final_dist
     result['lifespan_distribution_closed'] = final_dist
@@ -376,49 +572,81 @@ def process_demolition_data(
 
     # City Stats
     city_stats = []
-    for city in df['PROP_CITY'].value_counts().head(10).index:
-        city_df = df[df['PROP_CITY'] == city]
+    city_agg = df.groupby('PROP_CITY', observed=True)['lifespan'].agg(['size', 'mean'])
+    for city in most_common(df['PROP_CITY'], 10):
         city_stats.append({
             'city': city,
-            'count': int(len(city_df)),
-            'avg_lifespan': float(city_df['lifespan'].mean())
+            'count': int(city_agg.at[city, 'size']),
+            'avg_lifespan': float(city_agg.at[city, 'mean'])
         })
     result['city_stats'] = city_stats
 
     # Material Stats
+    # Aggregate per material once instead of slicing a sub-frame per material
     mat_stats = []
+    mat_agg = df.groupby('material_group', observed=True)['lifespan'].agg(['size', 'mean'])
+    type_by_mat = (df.groupby(['material_group', 'DEMOLITION_TYPE'], observed=True).size()
+                   .unstack(fill_value=0).reindex(columns=['RAZE', 'EXTDEM', 'INTDEM'], fill_value=0))
     for mat in df['material_group'].unique():
-        m_df = df[df['material_group'] == mat]
         mat_stats.append({
             'material': mat,
-            'count': int(len(m_df)),
-            'avg_lifespan': float(m_df['lifespan'].mean()),
+            'count': int(mat_agg.at[mat, 'size']),
+            'avg_lifespan': float(mat_agg.at[mat, 'mean']),
             'demolition_breakdown': {
-                'RAZE': int((m_df['DEMOLITION_TYPE'] == 'RAZE').sum()),
-                'EXTDEM': int((m_df['DEMOLITION_TYPE'] == 'EXTDEM').sum()),
-                'INTDEM': int((m_df['DEMOLITION_TYPE'] == 'INTDEM').sum())
+                'RAZE': int(type_by_mat.at[mat, 'RAZE']),
+                'EXTDEM': int(type_by_mat.at[mat, 'EXTDEM']),
+                'INTDEM': int(type_by_mat.at[mat, 'INTDEM'])
             }
         })
     mat_stats.sort(key=lambda x: x['count'], reverse=True)
     result['material_stats'] = mat_stats
 
     # Boxplot
-    raw_boxplot = {}
+    # Ship the box statistics instead of every raw lifespan. Quartiles use linear interpolation
+    # and the whiskers stop at the last value within 1.5 IQR, as the dashboard's boxplot plugin does.
+    def box_stats(lifespans):
+        vals = np.sort(lifespans.to_numpy(dtype=float))
+        q1, median, q3 = np.quantile(vals, [0.25, 0.5, 0.75])
+        fence = 1.5 * (q3 - q1)
+        inside = vals[(vals >= q1 - fence) & (vals <= q3 + fence)]
+        return {
+            'count': int(vals.size),
+            'min': float(vals[0]),
+            'q1': float(q1),
+            'median': float(median),
+            'q3': float(q3),
+            'max': float(vals[-1]),
+            'mean': float(vals.mean()),
+            'whiskerMin': float(inside[0]),
+            'whiskerMax': float(inside[-1]),
+            'outliers': vals[(vals < inside[0]) | (vals > inside[-1])].tolist()
+        }
+
+    box_materials = [mat['material'] for mat in mat_stats[:20]]
+    box_df = df[df['DEMOLITION_TYPE'].isin(['RAZE', 'EXTDEM', 'INTDEM']) & df['material_group'].isin(box_materials)]
+    type_boxes = {key: box_stats(lifespans) for key, lifespans in
+                  box_df.groupby(['DEMOLITION_TYPE', 'material_group'], observed=True)['lifespan']}
+    all_boxes = {mat: box_stats(lifespans) for mat, lifespans in
+                 box_df.groupby('material_group', observed=True)['lifespan']}
+    boxplot = {}
     for demo in ['RAZE', 'EXTDEM', 'INTDEM']:
-        raw_boxplot[demo] = {}
-        for mat in mat_stats[:20]:
-            m_df = df[(df['DEMOLITION_TYPE'] == demo) & (df['material_group'] == mat['material'])]
-            if len(m_df) > 0:
-                raw_boxplot[demo][mat['material']] = m_df['lifespan'].tolist()
-    result['material_lifespan_raw_by_demo'] = raw_boxplot
+        boxplot[demo] = {mat: type_boxes[(demo, mat)] for mat in box_materials if (demo, mat) in type_boxes}
+    # 'all' pools the three types per material (quartiles can't be combined client-side)
+    boxplot['all'] = {mat: all_boxes[mat] for mat in box_materials if mat in all_boxes}
+    result['material_lifespan_box_by_demo'] = boxplot
 
     return result
 
 
 def save_json(data, filename='boston_demolition_data.json'):
     print(f"Saving data to {filename}...")
-    with open(filename, 'w') as f:
-        json.dump(data, f, indent=2)
+    # Written compact: the dashboard only parses it, and indentation made up a large share of the file
+    if orjson is not None:
+        with open(filename, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(filename, 'w') as f:
+            json.dump(data, f, separators=(',', ':'))
     print("Done.")
 
 